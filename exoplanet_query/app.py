@@ -1,9 +1,19 @@
+import os
+import time
 import streamlit as st
 import plotly.express as px
+import plotly.io as pio
 import numpy as np
 from database.data_loader import get_exoplanet_data
+from database.shared_store import SHARED_DIR_ENV, dataset_version, open_shared_dataset, publish_shared_dataset, shared_dataset_exists
 from controller.controller import query_exoplanets
-from plot import method_radius_boxplots, radius_vs_mass_plot, temperature_vs_distance_plot, discovery_year_bar_chart, distance_histogram
+from controller.density import build_density_pyramids
+from controller.expressions import collect_column_stats, from_filters, matching_rows
+from controller.facets import build_facet_index
+from controller.similarity import build_similarity_index
+from controller.systems import build_system_layout
+from batch import ARTIFACT_DIR_ENV, figure_path
+from plot import method_radius_boxplots, radius_vs_mass_plot, temperature_vs_distance_plot, discovery_year_bar_chart, distance_histogram, density_map_plot, pretty
 
 # User friendly labels for query filters
 QUERY_LABELS = {
@@ -28,12 +38,98 @@ st.set_page_config(
 
 st.title("🔭 NASA Exoplanet Query App")
 
-# Load Data
-@st.cache_data(show_spinner=True)
-def load_data():
-    return get_exoplanet_data(save_to_db=False)
+# Load Data (re-fetched from the archive once the TTL expires). Each load
+# returns the frame with a version token; the per-dataset caches below are
+# keyed on that token and take the frame as an unhashed `_df`, because
+# Streamlit only hashes a sample of rows for large DataFrames and would
+# miss an edit outside the sample.
+DATA_REFRESH_SECONDS = 24 * 60 * 60
 
-data = load_data()
+@st.cache_data(show_spinner=True, ttl=DATA_REFRESH_SECONDS, max_entries=1)
+def load_data():
+    return get_exoplanet_data(save_to_db=False), time.time_ns()
+
+# Shared dataset: when several server processes run on one host, the data
+# is published once as memory-mapped column files and every worker maps
+# the same pages. cache_resource (not cache_data) avoids a per-rerun copy.
+# `version` changes when the dataset is republished (see
+# `python -m database.shared_store --refresh`), so workers reopen it.
+@st.cache_resource(show_spinner=True, max_entries=1)
+def load_shared_data(directory, version):
+    if not shared_dataset_exists(directory):
+        publish_shared_dataset(get_exoplanet_data(save_to_db=False), directory)
+        version = dataset_version(directory)
+    return open_shared_dataset(directory), version
+
+SHARED_DIR = os.environ.get(SHARED_DIR_ENV)
+data, data_version = load_shared_data(SHARED_DIR, dataset_version(SHARED_DIR)) if SHARED_DIR else load_data()
+
+# Per-column statistics used to order query filters by selectivity
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_column_stats(_df, version):
+    return collect_column_stats(_df)
+
+stats = load_column_stats(data, data_version)
+
+# Nearest-neighbor index for "similar planets" (built once per dataset load)
+@st.cache_resource(show_spinner=True, max_entries=2)
+def load_similarity_index(_df, version, log_scale):
+    return build_similarity_index(_df, log_scale=log_scale)
+
+# Host-grouped layout for the system browser. The previous layout is kept
+# so a refreshed dataset only re-aggregates the systems that changed.
+@st.cache_resource
+def previous_system_layout():
+    return {}
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_system_layout(_df, version):
+    holder = previous_system_layout()
+    previous = holder.get("layout")
+    layout = previous.refresh(_df) if previous is not None else build_system_layout(_df)
+    holder["layout"] = layout
+    return layout
+
+systems = load_system_layout(data, data_version)
+
+# Multi-resolution density histograms (zoom is served from these, not raw rows)
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_density_pyramids(_df, version):
+    return build_density_pyramids(_df)
+
+pyramids = load_density_pyramids(data, data_version)
+
+# Facet counts for the Query tab dropdowns (precomputed per dataset)
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_facet_index(_df, version):
+    return build_facet_index(_df)
+
+facets = load_facet_index(data, data_version)
+
+# Prebuilt figures written by batch.py after each data refresh
+ARTIFACT_DIR = os.environ.get(ARTIFACT_DIR_ENV)
+
+# Parsed once per file version; a new batch run changes the mtime
+@st.cache_resource(show_spinner=False, max_entries=32)
+def load_prebuilt_figure(path, mtime):
+    return pio.read_json(path)
+
+def prebuilt_figure(name):
+    """Return the prebuilt figure for `name`, or None if there is none."""
+    if not ARTIFACT_DIR:
+        return None
+    path = figure_path(ARTIFACT_DIR, name)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        return load_prebuilt_figure(path, mtime)
+    except (OSError, ValueError):
+        # Missing or unreadable artifact: build the figure instead
+        return None
+
+def get_figure(name, build):
+    """Serve a prebuilt figure when one exists, otherwise build it now."""
+    fig = prebuilt_figure(name)
+    return fig if fig is not None else build()
 
 
 # TABS (Query + Plot)
@@ -59,7 +155,7 @@ with tab_plot:
     This is one of the most important charts in exoplanet science!
     """)
 
-    fig = radius_vs_mass_plot(data, trendline=True)
+    fig = get_figure("radius_vs_mass", lambda: radius_vs_mass_plot(data, trendline=True))
     st.plotly_chart(fig, use_container_width=True)
 
     # ================================================================
@@ -78,7 +174,7 @@ with tab_plot:
     This helps us understand where different kinds of worlds tend to form and survive.
     """)
 
-    fig2 = temperature_vs_distance_plot(data)
+    fig2 = get_figure("temperature_vs_distance", lambda: temperature_vs_distance_plot(data))
     st.plotly_chart(fig2, use_container_width=True)
 
     # ================================================================
@@ -95,7 +191,7 @@ with tab_plot:
     • Improved radial velocity and transit techniques increased discovery rates \n
     """)
 
-    fig3 = discovery_year_bar_chart(data)
+    fig3 = get_figure("discovery_year", lambda: discovery_year_bar_chart(data))
     st.plotly_chart(fig3, use_container_width=True)
 
     # ================================================================
@@ -115,7 +211,7 @@ with tab_plot:
     than by where planets actually are.
     """)
 
-    fig = distance_histogram(data)
+    fig = get_figure("distance_histogram", lambda: distance_histogram(data))
 
     st.plotly_chart(
         fig,
@@ -150,7 +246,8 @@ with tab_plot:
     This makes discovery methods one of the biggest factors shaping our exoplanet catalog.
     """)
 
-    figs = method_radius_boxplots(data)
+    prebuilt = {key: prebuilt_figure(f"method_radius_{key}") for key in ("zoom", "full")}
+    figs = prebuilt if all(f is not None for f in prebuilt.values()) else method_radius_boxplots(data)
 
     st.subheader("Planet Radius by Discovery Method (Zoomed)")
     st.plotly_chart(figs["zoom"], use_container_width=True)
@@ -158,6 +255,52 @@ with tab_plot:
     st.subheader("Planet Radius by Discovery Method (Full Range)")
     st.plotly_chart(figs["full"], use_container_width=True)
 
+    # -------------------------------------------------
+    # DENSITY MAPS (ZOOMABLE)
+    # -------------------------------------------------
+    st.header("🗺️ Density Maps")
+
+    st.markdown("""
+    Where do planets pile up? These maps count planets in log-spaced bins,
+    so dense families (like super-Earths and hot Jupiters) stand out even
+    where thousands of points would overlap in a scatter plot.
+
+    Narrow the ranges below to zoom in; finer bins are served as you zoom.
+    """)
+
+    density_choice = st.radio(
+        "Density map",
+        list(pyramids),
+        format_func=lambda name: f"{pretty(pyramids[name].x)} vs {pretty(pyramids[name].y)}",
+        horizontal=True,
+    )
+    pyramid = pyramids[density_choice]
+
+    def log_range_slider(column, extent, key):
+        low = float(np.floor(extent[0] * 20) / 20)
+        high = float(np.ceil(extent[1] * 20) / 20)
+        return st.slider(
+            f"log₁₀({pretty(column)}) range",
+            min_value=low,
+            max_value=high,
+            value=(low, high),
+            step=0.05,
+            key=key,
+        )
+
+    d_col1, d_col2 = st.columns(2)
+    with d_col1:
+        x_range = log_range_slider(pyramid.x, pyramid.x_extent, f"density_x_{density_choice}")
+    with d_col2:
+        y_range = log_range_slider(pyramid.y, pyramid.y_extent, f"density_y_{density_choice}")
+
+    tile = pyramid.tile(x_range, y_range, max_bins=64)
+    st.plotly_chart(density_map_plot(tile), use_container_width=True)
+    st.caption(
+        f"Showing {int(tile['counts'].sum()):,} of {pyramid.total:,} planets "
+        f"in {tile['counts'].shape[1]}×{tile['counts'].shape[0]} bins (pyramid level {tile['level']})."
+    )
+
 # ================================================================
 # TAB 2 — QUERY PAGE
 # ================================================================
@@ -165,26 +308,51 @@ with tab_query:
 
     st.header("🔍 Filter Options")
 
+    # Live facet counts: read the current selections from session state so
+    # each dropdown's counts reflect the other active filters. Options and
+    # labels stay fixed per dataset (older Streamlit versions derive the
+    # widget identity from them and would reset the selection), so the
+    # counts are shown in a caption under each dropdown.
+    selections = {
+        "discoverymethod": st.session_state.get("query_method", "Any"),
+        "disc_facility": st.session_state.get("query_facility", "Any"),
+        "disc_year": st.session_state.get("query_year", "Any"),
+    }
+    selections = {column: None if value == "Any" else value for column, value in selections.items()}
+
+    text_filter = from_filters(
+        name=st.session_state.get("query_name"),
+        host=st.session_state.get("query_host"),
+    )
+    base_rows = matching_rows(text_filter, data, stats) if text_filter.children else None
+    facet_counts = facets.counts(selections, base_rows)
+
+    def facet_selectbox(column, key):
+        """Selectbox over a facet's values with its live counts as a caption."""
+        counts = facet_counts[column]
+        value = st.selectbox(QUERY_LABELS[column], ["Any", *facets.values[column]], key=key)
+
+        if value != "Any":
+            st.caption(f"{counts[value]:,} matching rows")
+        else:
+            top = counts[counts > 0].nlargest(3)
+            if len(top):
+                st.caption("Most rows: " + " · ".join(f"{v} ({n:,})" for v, n in top.items()))
+            else:
+                st.caption("No rows match the other filters")
+        return value
+
     # Filters inside the tab
     col1, col2 = st.columns(2)
 
     with col1:
-        planet_name = st.text_input(QUERY_LABELS["pl_name"])
-        method = st.selectbox(
-            QUERY_LABELS["discoverymethod"],
-            ["Any", *sorted(x for x in data["discoverymethod"].dropna().unique())]
-        )
-        facility = st.selectbox(
-            QUERY_LABELS["disc_facility"],
-            ["Any", *sorted(x for x in data["disc_facility"].dropna().unique())]
-        )
+        planet_name = st.text_input(QUERY_LABELS["pl_name"], key="query_name")
+        method = facet_selectbox("discoverymethod", "query_method")
+        facility = facet_selectbox("disc_facility", "query_facility")
 
     with col2:
-        discovery_year = st.selectbox(
-            QUERY_LABELS["disc_year"],
-            ["Any", *sorted(x for x in data["disc_year"].dropna().unique())]
-        )
-        host_name = st.text_input(QUERY_LABELS["hostname"])
+        discovery_year = facet_selectbox("disc_year", "query_year")
+        host_name = st.text_input(QUERY_LABELS["hostname"], key="query_host")
 
     # Run Query Button
     if st.button("Run Query"):
@@ -195,9 +363,82 @@ with tab_query:
             method=None if method == "Any" else method,
             host=host_name,
             facility=None if facility == "Any" else facility,
+            stats=stats,
         )
 
         renamed = filtered.rename(columns=QUERY_LABELS)
 
         st.subheader("Query Results")
-        st.dataframe(renamed, use_container_width=True)
\ No newline at end of file
+        st.dataframe(renamed, use_container_width=True)
+
+    # ------------------------------------------------
+    # PLANETARY SYSTEM BROWSER
+    # ------------------------------------------------
+    st.header("🌞 Planetary Systems")
+
+    st.markdown("""
+    Explore a host star and every planet known to orbit it.
+    """)
+
+    planet_counts = systems.summary["planet_count"]
+    system_host = st.selectbox(
+        QUERY_LABELS["hostname"],
+        systems.hosts,
+        index=None,
+        placeholder="Choose a host star",
+        format_func=lambda host: f"{host} ({planet_counts[host]} planets)",
+        key="system_host",
+    )
+
+    if system_host:
+        summary = systems.system_summary(system_host)
+
+        def fmt_range(low, high):
+            return "n/a" if np.isnan(low) else f"{low:.2f} – {high:.2f}"
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Planets", int(summary["planet_count"]))
+        m2.metric("Radius Range (R⊕)", fmt_range(summary["pl_rade_min"], summary["pl_rade_max"]))
+        m3.metric("Mass Range (M⊕)", fmt_range(summary["pl_masse_min"], summary["pl_masse_max"]))
+        m4.metric(QUERY_LABELS["st_rad"], "n/a" if np.isnan(summary["st_rad"]) else f"{summary['st_rad']:.2f}")
+
+        st.dataframe(
+            systems.planets(system_host).rename(columns=QUERY_LABELS),
+            use_container_width=True,
+        )
+
+    # ------------------------------------------------
+    # SIMILAR PLANETS (NEAREST NEIGHBORS)
+    # ------------------------------------------------
+    st.header("🪐 Similar Planets")
+
+    st.markdown("""
+    Find the known planets that most resemble a chosen one in radius, mass,
+    orbital period and equilibrium temperature. Planets are compared only on
+    the properties the chosen planet has measured.
+    """)
+
+    sim_col1, sim_col2 = st.columns(2)
+
+    with sim_col2:
+        n_similar = st.slider("Number of similar planets", min_value=1, max_value=50, value=10)
+        log_scale = st.checkbox("Compare radius, mass and period on a log scale", value=True)
+
+    similarity_index = load_similarity_index(data, data_version, log_scale)
+
+    with sim_col1:
+        reference = st.selectbox(
+            QUERY_LABELS["pl_name"],
+            similarity_index.names,
+            index=None,
+            placeholder="Choose a planet",
+            key="similar_planet",
+        )
+
+    if reference:
+        similar = similarity_index.query(pl_name=reference, k=n_similar)
+        st.subheader(f"Planets Similar to {reference}")
+        st.dataframe(
+            similar.rename(columns={**QUERY_LABELS, "distance": "Distance (std. units)"}),
+            use_container_width=True,
+        )
\ No newline at end of file
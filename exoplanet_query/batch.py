@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import plotly.io as pio
+
+from database.data_loader import get_exoplanet_data
+from database.shared_store import open_shared_dataset, refresh_shared_dataset, shared_dataset_exists
+from controller.controller import query_exoplanets
+from controller.expressions import collect_column_stats
+from plot import method_radius_boxplots, radius_vs_mass_plot, temperature_vs_distance_plot, discovery_year_bar_chart, distance_histogram
+
+# Environment variable pointing the web tier at prebuilt artifacts
+ARTIFACT_DIR_ENV = "EXOPLANET_ARTIFACT_DIR"
+
+QUERY_FILTERS = ("name", "year", "method", "host", "facility")
+
+
+# --------------------------------------------------------------
+# 💫 1. Figure registry
+# --------------------------------------------------------------
+def build_figures(df):
+    """
+    Yield (name, builder) pairs for every curated figure in plot.py.
+
+    Builders are called lazily so each one can be timed separately.
+    """
+    yield "radius_vs_mass", lambda: radius_vs_mass_plot(df, trendline=True)
+    yield "temperature_vs_distance", lambda: temperature_vs_distance_plot(df)
+    yield "discovery_year", lambda: discovery_year_bar_chart(df)
+    yield "distance_histogram", lambda: distance_histogram(df)
+    yield "method_radius", lambda: method_radius_boxplots(df)
+
+
+def figure_path(artifact_dir, name):
+    """Return the path of a prebuilt figure's JSON file."""
+    return os.path.join(artifact_dir, "figures", f"{name}.json")
+
+
+# --------------------------------------------------------------
+# 💫 2. Saved query specs
+# --------------------------------------------------------------
+def load_query_spec(path):
+    """
+    Read a saved-query spec file.
+
+    The file holds a JSON list of {"name": ..., "filters": {...}} objects,
+    where filters are keyword arguments to query_exoplanets.
+
+    Returns:
+        list[dict]: validated query entries
+    """
+    with open(path) as f:
+        spec = json.load(f)
+
+    if not isinstance(spec, list):
+        raise ValueError(f"{path}: expected a JSON list of queries")
+
+    names = set()
+    for entry in spec:
+        name = entry.get("name")
+        if not name:
+            raise ValueError(f"{path}: every query needs a 'name'")
+        if not isinstance(name, str) or "/" in name or "\\" in name or ".." in name:
+            raise ValueError(
+                f"{path}: query name {name!r} is used as a file name and must not "
+                f"contain path separators or '..'"
+            )
+        if name in names:
+            raise ValueError(f"{path}: duplicate query name '{name}'")
+        names.add(name)
+
+        filters = entry.get("filters", {})
+        if not isinstance(filters, dict):
+            raise ValueError(f"{path}: query '{name}' filters must be a JSON object")
+
+        unknown = set(filters) - set(QUERY_FILTERS)
+        if unknown:
+            raise ValueError(
+                f"{path}: query '{name}' has unknown filters {sorted(unknown)}; "
+                f"expected any of {list(QUERY_FILTERS)}"
+            )
+
+        for key, value in filters.items():
+            if value is None or value == "":
+                continue
+            if key == "year":
+                try:
+                    valid = not isinstance(value, bool) and int(value) == float(value)
+                except (TypeError, ValueError):
+                    valid = False
+                if not valid:
+                    raise ValueError(f"{path}: query '{name}' has a non-integer year {value!r}")
+            elif not isinstance(value, str):
+                raise ValueError(f"{path}: query '{name}' filter '{key}' must be a string, got {value!r}")
+
+    return spec
+
+
+# --------------------------------------------------------------
+# 💫 3. Batch run
+# --------------------------------------------------------------
+def _write_atomic(path, write):
+    """
+    Call `write(tmp_path)` and move the result into place with os.replace,
+    so the live app never reads a partially written artifact.
+    """
+    tmp = f"{path}.tmp-{os.getpid()}"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+def _write_figure(fig, out_dir, name):
+    """Write a figure as standalone HTML and as Plotly JSON."""
+    html = os.path.join(out_dir, "figures", f"{name}.html")
+    return [
+        _write_atomic(html, lambda tmp: fig.write_html(tmp, include_plotlyjs="cdn")),
+        _write_atomic(figure_path(out_dir, name), lambda tmp: pio.write_json(fig, tmp)),
+    ]
+
+
+def run_batch(df, out_dir, queries=(), render_figures=True):
+    """
+    Render all figures and run saved queries against an already-loaded dataset.
+
+    Args:
+        df (DataFrame): full dataset
+        out_dir (str): artifact output directory
+        queries (list[dict]): entries from load_query_spec
+        render_figures (bool): whether to render plot.py figures
+
+    Returns:
+        list[dict]: one record per item with its timing and output files
+    """
+    os.makedirs(os.path.join(out_dir, "figures"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "queries"), exist_ok=True)
+
+    items = []
+    stats = collect_column_stats(df) if queries else None
+
+    if render_figures:
+        for name, build in build_figures(df):
+            start = time.perf_counter()
+            result = build()
+            figs = result if isinstance(result, dict) else {None: result}
+
+            files = []
+            for suffix, fig in figs.items():
+                fig_name = f"{name}_{suffix}" if suffix else name
+                files += _write_figure(fig, out_dir, fig_name)
+
+            items.append({
+                "kind": "figure",
+                "name": name,
+                "seconds": time.perf_counter() - start,
+                "files": files,
+            })
+
+    for entry in queries:
+        start = time.perf_counter()
+        try:
+            result = query_exoplanets(df, **entry.get("filters", {}), stats=stats)
+        except Exception as exc:
+            # Record the failure and keep going so the manifest still
+            # describes every artifact written by this run.
+            items.append({
+                "kind": "query",
+                "name": entry["name"],
+                "filters": entry.get("filters", {}),
+                "error": f"{type(exc).__name__}: {exc}",
+                "seconds": time.perf_counter() - start,
+                "files": [],
+            })
+            continue
+
+        csv_path = os.path.join(out_dir, "queries", f"{entry['name']}.csv")
+        json_path = os.path.join(out_dir, "queries", f"{entry['name']}.json")
+        _write_atomic(csv_path, lambda tmp: result.to_csv(tmp, index=False))
+        _write_atomic(json_path, lambda tmp: result.to_json(tmp, orient="records"))
+
+        items.append({
+            "kind": "query",
+            "name": entry["name"],
+            "filters": entry.get("filters", {}),
+            "rows": len(result),
+            "seconds": time.perf_counter() - start,
+            "files": [csv_path, json_path],
+        })
+
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Pre-render exoplanet figures and saved queries to disk."
+    )
+    parser.add_argument("--out", required=True, help="artifact output directory")
+    parser.add_argument("--spec", help="JSON file of saved queries to run")
+    parser.add_argument("--data-dir", help="read a shared dataset directory instead of fetching")
+    parser.add_argument("--no-figures", action="store_true", help="skip figure rendering")
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help="fetch fresh data and republish it to --data-dir before rendering",
+    )
+    args = parser.parse_args(argv)
+
+    if args.refresh and not args.data_dir:
+        parser.error("--refresh needs --data-dir (without it the data is always fetched fresh)")
+
+    queries = load_query_spec(args.spec) if args.spec else []
+
+    start = time.perf_counter()
+    if args.refresh:
+        refresh_shared_dataset(args.data_dir)
+
+    if args.data_dir and shared_dataset_exists(args.data_dir):
+        df = open_shared_dataset(args.data_dir)
+    else:
+        df = get_exoplanet_data(save_to_db=False)
+    load_seconds = time.perf_counter() - start
+    print(f"{'load':>8}  {'dataset':<32} {load_seconds:8.3f}s  ({len(df)} rows)")
+
+    items = run_batch(df, args.out, queries, render_figures=not args.no_figures)
+
+    for item in items:
+        rows = f"  ({item['rows']} rows)" if "rows" in item else ""
+        if "error" in item:
+            rows = f"  FAILED: {item['error']}"
+        print(f"{item['kind']:>8}  {item['name']:<32} {item['seconds']:8.3f}s{rows}")
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "dataset_rows": len(df),
+        "load_seconds": load_seconds,
+        "items": items,
+    }
+    def write_manifest(tmp):
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    _write_atomic(os.path.join(args.out, "manifest.json"), write_manifest)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from controller.expressions import And, evaluate, from_filters
+
 # --------------------------------------------------------------
 # 💫 1. Query/filtering logic
 # --------------------------------------------------------------
@@ -8,37 +10,56 @@ def query_exoplanets(
     method=None,
     host=None,
     facility=None,
+    where=None,
+    stats=None,
 ):
     """
     Filter the exoplanet DataFrame based on user selections.
 
     Args:
         df (DataFrame): full dataset
-        name (str): substring match
+        name (str): case-insensitive substring match
         year (int or None)
         method (str or None)
-        host (str): substring match
+        host (str): case-insensitive substring match
         facility (str or None)
+        where (Expr or None): extra filter expression ANDed with the above
+        stats (dict or None): column statistics used to order the filters
+                              (see expressions.collect_column_stats)
 
     Returns:
         DataFrame: filtered dataset
     """
 
-    filtered = df.copy()
-
-    if name:
-        filtered = filtered[filtered["pl_name"].str.contains(name, case=False, na=False)]
+    expr = from_filters(name=name, year=year, method=method, host=host, facility=facility)
+    if where is not None:
+        expr = And(expr, where)
 
-    if year:
-        filtered = filtered[filtered["disc_year"] == int(year)]
+    return evaluate(expr, df, stats)
 
-    if method:
-        filtered = filtered[filtered["discoverymethod"] == method]
+# --------------------------------------------------------------
+# 💫 2. One row per planet
+# --------------------------------------------------------------
+def planet_medians(df, columns, first=()):
+    """
+    Reduce the dataset to one row per planet.
 
-    if host:
-        filtered = filtered[filtered["hostname"].str.contains(host, case=False, na=False)]
+    The archive lists several parameter sets per planet, so each planet
+    gets the median of its reported values (missing values ignored);
+    otherwise well-studied planets would be over-weighted.
 
-    if facility:
-        filtered = filtered[filtered["disc_facility"] == facility]
+    Args:
+        df (DataFrame): full dataset
+        columns (iterable): numeric columns to take the median of
+        first (iterable): columns to take the first value of (e.g. hostname)
 
-    return filtered
\ No newline at end of file
+    Returns:
+        DataFrame: indexed by pl_name (sorted), with `first` then `columns`
+    """
+    columns, first = list(columns), list(first)
+    return (
+        df[["pl_name", *first, *columns]]
+        .dropna(subset=["pl_name"])
+        .groupby("pl_name", observed=True, sort=True)
+        .agg({**{c: "first" for c in first}, **{c: "median" for c in columns}})
+    )
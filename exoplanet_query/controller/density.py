@@ -0,0 +1,141 @@
+import numpy as np
+
+from controller.controller import planet_medians
+
+# Column pairs offered as density maps: name -> (x column, y column)
+DENSITY_PAIRS = {
+    "radius_mass": ("pl_rade", "pl_masse"),
+    "period_temperature": ("pl_orbper", "pl_eqt"),
+}
+
+
+# --------------------------------------------------------------
+# 💫 1. Multi-resolution log-binned histograms
+# --------------------------------------------------------------
+class DensityPyramid:
+    """
+    Precomputed 2D histograms of two columns in log10 space at several
+    resolutions, counting planets (one point per planet, see
+    planet_medians).
+
+    Level L splits each axis into 2**L equal log-width bins. The finest
+    level is binned once from the data; each coarser level sums 2x2
+    blocks of the one below, so building the pyramid costs one pass over
+    the data and serving a zoom never touches the raw rows.
+    """
+
+    def __init__(self, df, x, y, min_level=3, max_level=9):
+        """
+        Build the pyramid.
+
+        Args:
+            df (DataFrame): full dataset
+            x (str): x-axis column (positive per-planet medians only)
+            y (str): y-axis column (positive per-planet medians only)
+            min_level (int): coarsest level (2**min_level bins per axis)
+            max_level (int): finest level (2**max_level bins per axis)
+        """
+        self.x = x
+        self.y = y
+        self.min_level = min_level
+        self.max_level = max_level
+
+        values = planet_medians(df, [x, y]).to_numpy(dtype=float)
+        values = values[(values > 0).all(axis=1)]
+        log_x, log_y = np.log10(values[:, 0]), np.log10(values[:, 1])
+
+        self.x_extent = self._extent(log_x)
+        self.y_extent = self._extent(log_y)
+
+        n = 2 ** max_level
+        counts, _, _ = np.histogram2d(
+            log_y, log_x, bins=n, range=[self.y_extent, self.x_extent]
+        )
+
+        # counts[level] has shape (2**level, 2**level), rows = y bins
+        self.counts = {max_level: counts.astype(np.int32)}
+        for level in range(max_level - 1, min_level - 1, -1):
+            finer = self.counts[level + 1]
+            m = 2 ** level
+            self.counts[level] = finer.reshape(m, 2, m, 2).sum(axis=(1, 3))
+
+    @staticmethod
+    def _extent(values):
+        """Return a (low, high) log range covering the values."""
+        if not len(values):
+            return (0.0, 1.0)
+        low, high = float(values.min()), float(values.max())
+        if low == high:
+            return (low - 0.5, high + 0.5)
+        return (low, high)
+
+    @property
+    def total(self):
+        """Number of planets binned (planets with both values positive)."""
+        return int(self.counts[self.min_level].sum())
+
+    # ----------------------------------------------------------
+    # 💫 2. Tile selection
+    # ----------------------------------------------------------
+    def level_for(self, x_range=None, y_range=None, max_bins=64):
+        """
+        Pick the finest level that shows at most `max_bins` bins along
+        either axis of the visible window.
+        """
+        fraction = max(
+            self._fraction(x_range, self.x_extent),
+            self._fraction(y_range, self.y_extent),
+        )
+        level = int(np.floor(np.log2(max_bins / fraction))) if fraction > 0 else self.max_level
+        return int(np.clip(level, self.min_level, self.max_level))
+
+    @staticmethod
+    def _fraction(window, extent):
+        if window is None:
+            return 1.0
+        low, high = max(window[0], extent[0]), min(window[1], extent[1])
+        return max(high - low, 0.0) / (extent[1] - extent[0])
+
+    @staticmethod
+    def _slice(window, extent, n):
+        """Return the [start, stop) bin indices covering `window` at n bins."""
+        if window is None:
+            return 0, n
+        width = (extent[1] - extent[0]) / n
+        start = int(np.clip(np.floor((window[0] - extent[0]) / width), 0, n - 1))
+        stop = int(np.clip(np.ceil((window[1] - extent[0]) / width), start + 1, n))
+        return start, stop
+
+    def tile(self, x_range=None, y_range=None, max_bins=64):
+        """
+        Return the pre-aggregated counts covering a visible window.
+
+        Args:
+            x_range (tuple or None): visible (low, high) in log10 x units
+            y_range (tuple or None): visible (low, high) in log10 y units
+            max_bins (int): cap on bins per axis; the payload stays within
+                            about max_bins² cells whatever the catalog size
+
+        Returns:
+            dict: level, x_edges, y_edges (log10 units) and counts with
+                  shape (len(y_edges) - 1, len(x_edges) - 1)
+        """
+        level = self.level_for(x_range, y_range, max_bins)
+        n = 2 ** level
+
+        x0, x1 = self._slice(x_range, self.x_extent, n)
+        y0, y1 = self._slice(y_range, self.y_extent, n)
+
+        return {
+            "x": self.x,
+            "y": self.y,
+            "level": level,
+            "x_edges": np.linspace(*self.x_extent, n + 1)[x0:x1 + 1],
+            "y_edges": np.linspace(*self.y_extent, n + 1)[y0:y1 + 1],
+            "counts": self.counts[level][y0:y1, x0:x1],
+        }
+
+
+def build_density_pyramids(df):
+    """Build a DensityPyramid for every pair in DENSITY_PAIRS (once per dataset load)."""
+    return {name: DensityPyramid(df, x, y) for name, (x, y) in DENSITY_PAIRS.items()}
@@ -0,0 +1,414 @@
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Columns with more distinct values than this only keep a distinct count
+MAX_TRACKED_VALUES = 1000
+
+# Number of quantile points kept per numeric column
+N_QUANTILES = 101
+
+# Fallback estimates when no statistics are available
+DEFAULT_SELECTIVITY = 0.5
+SUBSTRING_SELECTIVITY = 0.1
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+# --------------------------------------------------------------
+# 💫 1. Expression nodes
+# --------------------------------------------------------------
+class Expr:
+    """
+    Base class for filter expressions.
+
+    Expressions combine with & (AND), | (OR) and ~ (NOT):
+
+        (Eq("discoverymethod", "Transit") | Eq("discoverymethod", "Imaging"))
+            & Range("disc_year", low=2015) & ~Contains("hostname", "Kepler")
+    """
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+
+@dataclass(frozen=True, eq=False)
+class Eq(Expr):
+    """Column equals value."""
+    column: str
+    value: object
+
+    def mask(self, values):
+        return (values == self.value).to_numpy(dtype=bool)
+
+
+@dataclass(frozen=True, eq=False)
+class In(Expr):
+    """Column value is one of `values`."""
+    column: str
+    values: tuple
+
+    def __post_init__(self):
+        object.__setattr__(self, "values", tuple(self.values))
+
+    def mask(self, values):
+        return values.isin(self.values).to_numpy(dtype=bool)
+
+
+@dataclass(frozen=True, eq=False)
+class Range(Expr):
+    """Column lies in the closed range [low, high]; either bound may be None."""
+    column: str
+    low: object = None
+    high: object = None
+
+    def mask(self, values):
+        if isinstance(values.dtype, pd.CategoricalDtype) and not values.cat.ordered:
+            # Shared datasets store text as unordered Categoricals, which
+            # refuse < and >; compare the categories by value and map the
+            # result back through the codes (-1 = missing never matches).
+            matches = np.append(self.mask(pd.Series(values.cat.categories, dtype=object)), False)
+            return matches[values.cat.codes.to_numpy()]
+
+        result = values.notna()
+        if self.low is not None:
+            result &= values >= self.low
+        if self.high is not None:
+            result &= values <= self.high
+        return result.to_numpy(dtype=bool)
+
+
+@dataclass(frozen=True, eq=False)
+class Contains(Expr):
+    """Case-insensitive literal substring match."""
+    column: str
+    text: str
+
+    def mask(self, values):
+        return values.str.contains(self.text, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+
+class And(Expr):
+    """All children match. An empty And matches every row."""
+
+    def __init__(self, *children):
+        self.children = tuple(children)
+
+    def __repr__(self):
+        return f"And{self.children!r}"
+
+
+class Or(Expr):
+    """Any child matches. An empty Or matches nothing."""
+
+    def __init__(self, *children):
+        self.children = tuple(children)
+
+    def __repr__(self):
+        return f"Or{self.children!r}"
+
+
+class Not(Expr):
+    """
+    Child does not match.
+
+    Missing values never satisfy a predicate, so NOT of a predicate on a
+    missing value is true (the SQL translation matches this).
+    """
+
+    def __init__(self, child):
+        self.child = child
+
+    def __repr__(self):
+        return f"Not({self.child!r})"
+
+
+PREDICATES = (Eq, In, Range, Contains)
+
+
+def from_filters(name=None, year=None, method=None, host=None, facility=None):
+    """
+    Build the expression for the Query tab's fixed filters.
+
+    Args mirror query_exoplanets; empty filters are left out.
+
+    Returns:
+        And: conjunction of the active filters
+    """
+    terms = []
+    if name:
+        terms.append(Contains("pl_name", name))
+    if year:
+        terms.append(Eq("disc_year", int(year)))
+    if method:
+        terms.append(Eq("discoverymethod", method))
+    if host:
+        terms.append(Contains("hostname", host))
+    if facility:
+        terms.append(Eq("disc_facility", facility))
+    return And(*terms)
+
+
+# --------------------------------------------------------------
+# 💫 2. Per-column statistics (gathered once at load time)
+# --------------------------------------------------------------
+def collect_column_stats(df):
+    """
+    Gather the per-column statistics the planner uses for selectivity.
+
+    Returns:
+        dict: column -> {"rows", "nulls", "distinct", "counts", "quantiles"}
+              where counts (value -> rows) is kept for low-cardinality
+              columns and quantiles for numeric columns
+    """
+    stats = {}
+
+    for column in df.columns:
+        values = df[column]
+        non_null = values.dropna()
+
+        entry = {
+            "rows": len(values),
+            "nulls": len(values) - len(non_null),
+            "distinct": int(non_null.nunique()),
+            "counts": None,
+            "quantiles": None,
+        }
+
+        if entry["distinct"] <= MAX_TRACKED_VALUES:
+            counts = non_null.value_counts()
+            entry["counts"] = {k: int(v) for k, v in counts[counts > 0].items()}
+
+        if pd.api.types.is_numeric_dtype(values) and len(non_null):
+            entry["quantiles"] = np.quantile(
+                non_null.to_numpy(dtype=float), np.linspace(0, 1, N_QUANTILES)
+            )
+
+        stats[column] = entry
+
+    return stats
+
+
+def _fraction_below(quantiles, x):
+    """Estimated fraction of non-null values <= x from quantile points."""
+    return float(np.interp(x, quantiles, np.linspace(0, 1, len(quantiles)), left=0.0, right=1.0))
+
+
+def estimate_selectivity(expr, stats=None):
+    """
+    Estimate the fraction of rows an expression matches.
+
+    Returns:
+        float: between 0 and 1
+    """
+    if isinstance(expr, And):
+        return float(np.prod([estimate_selectivity(c, stats) for c in expr.children]))
+    if isinstance(expr, Or):
+        return 1.0 - float(np.prod([1.0 - estimate_selectivity(c, stats) for c in expr.children]))
+    if isinstance(expr, Not):
+        return 1.0 - estimate_selectivity(expr.child, stats)
+
+    entry = (stats or {}).get(expr.column)
+    if entry is None or entry["rows"] == 0:
+        return SUBSTRING_SELECTIVITY if isinstance(expr, Contains) else DEFAULT_SELECTIVITY
+
+    rows = entry["rows"]
+    present = 1.0 - entry["nulls"] / rows
+
+    if isinstance(expr, Eq):
+        if entry["counts"] is not None:
+            return entry["counts"].get(expr.value, 0) / rows
+        return present / max(entry["distinct"], 1)
+
+    if isinstance(expr, In):
+        if entry["counts"] is not None:
+            return sum(entry["counts"].get(v, 0) for v in set(expr.values)) / rows
+        return min(present, len(set(expr.values)) * present / max(entry["distinct"], 1))
+
+    if isinstance(expr, Range):
+        quantiles = entry["quantiles"]
+        if quantiles is None:
+            return DEFAULT_SELECTIVITY * present
+        low = 0.0 if expr.low is None else _fraction_below(quantiles, expr.low)
+        high = 1.0 if expr.high is None else _fraction_below(quantiles, expr.high)
+        return max(high - low, 0.0) * present
+
+    return SUBSTRING_SELECTIVITY * present
+
+
+# --------------------------------------------------------------
+# 💫 3. Planning + evaluation
+# --------------------------------------------------------------
+def plan(expr, stats=None):
+    """
+    Compile an expression into an evaluation plan.
+
+    Nested ANDs/ORs are flattened, double negations removed, and children
+    reordered by estimated selectivity: most selective first under AND
+    (so later predicates see the fewest rows) and least selective first
+    under OR (so later predicates only test rows not yet matched).
+
+    Returns:
+        Expr: an equivalent, reordered expression
+    """
+    if isinstance(expr, Not):
+        child = plan(expr.child, stats)
+        return child.child if isinstance(child, Not) else Not(child)
+
+    if isinstance(expr, (And, Or)):
+        kind = type(expr)
+        children = []
+        for child in (plan(c, stats) for c in expr.children):
+            children.extend(child.children if isinstance(child, kind) else [child])
+
+        if len(children) == 1:
+            return children[0]
+
+        children.sort(
+            key=lambda c: estimate_selectivity(c, stats),
+            reverse=kind is Or,
+        )
+        return kind(*children)
+
+    if not isinstance(expr, PREDICATES):
+        raise TypeError(f"Unsupported filter expression: {expr!r}")
+    return expr
+
+
+def _matching_rows(expr, df, rows):
+    """Return the subset of row positions `rows` (sorted) that match `expr`."""
+    if isinstance(expr, And):
+        for child in expr.children:
+            if not len(rows):
+                break
+            rows = _matching_rows(child, df, rows)
+        return rows
+
+    if isinstance(expr, Or):
+        matched = []
+        remaining = rows
+        for child in expr.children:
+            if not len(remaining):
+                break
+            hit = _matching_rows(child, df, remaining)
+            matched.append(hit)
+            remaining = np.setdiff1d(remaining, hit, assume_unique=True)
+        if not matched:
+            return rows[:0]
+        return np.sort(np.concatenate(matched))
+
+    if isinstance(expr, Not):
+        hit = _matching_rows(expr.child, df, rows)
+        return np.setdiff1d(rows, hit, assume_unique=True)
+
+    if not len(rows):
+        return rows
+    values = df[expr.column]
+    if len(rows) < len(df):
+        values = values.iloc[rows]
+    return rows[expr.mask(values)]
+
+
+def matching_rows(expr, df, stats=None):
+    """
+    Plan and evaluate an expression, returning matching row positions.
+
+    Returns:
+        numpy.ndarray: sorted positions of the matching rows
+    """
+    return _matching_rows(plan(expr, stats), df, np.arange(len(df)))
+
+
+def evaluate(expr, df, stats=None):
+    """
+    Filter a DataFrame with an expression.
+
+    The expression is planned with `stats` (see collect_column_stats),
+    then evaluated over row positions so each predicate only inspects
+    rows that survived the previous ones, stopping as soon as the
+    intermediate result is empty.
+
+    Returns:
+        DataFrame: matching rows in their original order
+    """
+    rows = matching_rows(expr, df, stats)
+    if len(rows) == len(df):
+        return df
+    return df.iloc[rows]
+
+
+# --------------------------------------------------------------
+# 💫 4. SQL translation (for the Database backend)
+# --------------------------------------------------------------
+def _identifier(column):
+    if not _IDENTIFIER.match(column):
+        raise ValueError(f"Invalid column name: {column!r}")
+    return column
+
+
+def _param(value):
+    """Convert numpy scalars to plain Python values for sqlite3."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def to_sql(expr):
+    """
+    Translate an expression into a parameterized SQL WHERE clause.
+
+    SQLite's LIKE is case-insensitive for ASCII only, so non-ASCII
+    substring matches may differ from the DataFrame path.
+
+    Returns:
+        tuple[str, list]: clause and its parameters
+    """
+    if isinstance(expr, And):
+        if not expr.children:
+            return "1", []
+        parts = [to_sql(c) for c in expr.children]
+        return "(" + " AND ".join(p[0] for p in parts) + ")", [x for p in parts for x in p[1]]
+
+    if isinstance(expr, Or):
+        if not expr.children:
+            return "0", []
+        parts = [to_sql(c) for c in expr.children]
+        return "(" + " OR ".join(p[0] for p in parts) + ")", [x for p in parts for x in p[1]]
+
+    if isinstance(expr, Not):
+        clause, params = to_sql(expr.child)
+        # NULL comparisons count as "no match", as in the DataFrame path
+        return f"NOT COALESCE({clause}, 0)", params
+
+    column = _identifier(expr.column)
+
+    if isinstance(expr, Eq):
+        return f"{column} = ?", [_param(expr.value)]
+
+    if isinstance(expr, In):
+        if not expr.values:
+            return "0", []
+        marks = ", ".join("?" for _ in expr.values)
+        return f"{column} IN ({marks})", [_param(v) for v in expr.values]
+
+    if isinstance(expr, Range):
+        terms, params = [f"{column} IS NOT NULL"], []
+        if expr.low is not None:
+            terms.append(f"{column} >= ?")
+            params.append(_param(expr.low))
+        if expr.high is not None:
+            terms.append(f"{column} <= ?")
+            params.append(_param(expr.high))
+        return "(" + " AND ".join(terms) + ")", params
+
+    if isinstance(expr, Contains):
+        escaped = expr.text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"{column} LIKE ? ESCAPE '\\'", [f"%{escaped}%"]
+
+    raise TypeError(f"Unsupported filter expression: {expr!r}")
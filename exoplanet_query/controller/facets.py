@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+# Categorical columns offered as Query tab dropdowns
+FACET_COLUMNS = ("discoverymethod", "disc_facility", "disc_year")
+
+# Largest joint count table kept in memory; above this, counts come from
+# posting-list intersections instead
+MAX_CUBE_CELLS = 5_000_000
+
+
+# --------------------------------------------------------------
+# 💫 1. Facet index
+# --------------------------------------------------------------
+class FacetIndex:
+    """
+    Value counts for categorical columns that follow the current filters.
+
+    Built once per dataset: every facet column is factorized into integer
+    codes and a joint count table (one axis per facet, plus a slot for
+    missing values) is precomputed. Facet counts for a selection are then
+    a slice-and-sum over that table, independent of catalog size. Extra
+    row filters (e.g. text search) rebuild the table from just the
+    matching rows.
+
+    If the joint table would be too large, each value instead keeps a
+    sorted posting list of its rows (CSR-style: a value-sorted row
+    permutation plus offsets) and counts come from intersecting the
+    selected values' lists. Either way the full table is never rescanned.
+
+    Each facet is counted with every filter applied except its own, so a
+    dropdown shows how many rows each alternative value would return.
+    """
+
+    def __init__(self, df, columns=FACET_COLUMNS):
+        """
+        Build the index.
+
+        Args:
+            df (DataFrame): full dataset
+            columns (tuple): categorical columns to facet on
+        """
+        self.columns = tuple(columns)
+        self.n_rows = len(df)
+        self.values = {}
+        self.totals = {}
+        self._codes = {}
+        self._rows = {}
+        self._offsets = {}
+        self._lookup = {}
+
+        for column in self.columns:
+            codes, values = pd.factorize(df[column], sort=True)
+            counts = np.bincount(codes[codes >= 0], minlength=len(values))
+
+            rows = np.argsort(codes, kind="stable")
+            rows = rows[codes[rows] >= 0]
+
+            self.values[column] = list(values)
+            self.totals[column] = counts
+            self._codes[column] = codes
+            self._rows[column] = rows
+            self._offsets[column] = np.concatenate([[0], np.cumsum(counts)])
+            self._lookup[column] = {value: i for i, value in enumerate(values)}
+
+        self._shape = tuple(len(self.values[c]) + 1 for c in self.columns)
+        self._cube = self._joint_counts() if np.prod(self._shape) <= MAX_CUBE_CELLS else None
+
+    def _joint_counts(self, rows=None):
+        """
+        Count rows per combination of facet values (index 0 = missing).
+        """
+        codes = [
+            (self._codes[c] if rows is None else self._codes[c][rows]) + 1
+            for c in self.columns
+        ]
+        keys = np.ravel_multi_index(codes, self._shape)
+        return np.bincount(keys, minlength=int(np.prod(self._shape))).reshape(self._shape)
+
+    def _counts_from_cube(self, cube, column, selections):
+        """Sum the joint table over every facet but `column`, fixing selected values."""
+        index = []
+        for other in self.columns:
+            value = selections.get(other)
+            if other == column or value is None:
+                index.append(slice(None))
+                continue
+            code = self._lookup[other].get(value)
+            if code is None:
+                return np.zeros(len(self.values[column]), dtype=np.int64)
+            index.append(code + 1)
+
+        sub = cube[tuple(index)]
+        free = [c for c, i in zip(self.columns, index) if isinstance(i, slice)]
+        sub = np.moveaxis(sub, free.index(column), 0)
+        return sub.reshape(sub.shape[0], -1).sum(axis=1)[1:]
+
+    def postings(self, column, value):
+        """Return the sorted row positions holding `value` in `column`."""
+        code = self._lookup[column].get(value)
+        if code is None:
+            return np.array([], dtype=np.intp)
+        offsets = self._offsets[column]
+        return self._rows[column][offsets[code]:offsets[code + 1]]
+
+    # ----------------------------------------------------------
+    # 💫 2. Live counts
+    # ----------------------------------------------------------
+    def matching_rows(self, selections, base_rows=None, exclude=None):
+        """
+        Intersect the posting lists of the selected values.
+
+        Args:
+            selections (dict): column -> selected value (None = any)
+            base_rows (ndarray or None): sorted row positions already
+                                         matched by non-facet filters
+            exclude (str or None): facet column to leave out
+
+        Returns:
+            ndarray or None: sorted row positions, or None when nothing
+                             constrains the match (every row matches)
+        """
+        lists = [
+            self.postings(column, value)
+            for column, value in selections.items()
+            if value is not None and column != exclude
+        ]
+        if base_rows is not None:
+            lists.append(base_rows)
+        if not lists:
+            return None
+
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def counts(self, selections=None, base_rows=None):
+        """
+        Return per-facet value counts for the current filters.
+
+        Args:
+            selections (dict or None): column -> selected value (None = any)
+            base_rows (ndarray or None): sorted row positions matched by
+                                         other filters (e.g. text search)
+
+        Returns:
+            dict: column -> pandas Series of counts indexed by value
+        """
+        selections = selections or {}
+        result = {}
+
+        if self._cube is not None:
+            cube = self._cube if base_rows is None else self._joint_counts(base_rows)
+            for column in self.columns:
+                counts = self._counts_from_cube(cube, column, selections)
+                result[column] = pd.Series(counts, index=self.values[column])
+            return result
+
+        for column in self.columns:
+            rows = self.matching_rows(selections, base_rows, exclude=column)
+            if rows is None:
+                counts = self.totals[column]
+            else:
+                codes = self._codes[column][rows]
+                counts = np.bincount(codes[codes >= 0], minlength=len(self.values[column]))
+            result[column] = pd.Series(counts, index=self.values[column])
+
+        return result
+
+
+def build_facet_index(df):
+    """Build a FacetIndex over FACET_COLUMNS (once per dataset load)."""
+    return FacetIndex(df)
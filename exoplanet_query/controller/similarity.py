@@ -0,0 +1,146 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from controller.controller import planet_medians
+
+# Planet properties that define "similar"
+SIMILARITY_FEATURES = ("pl_rade", "pl_masse", "pl_orbper", "pl_eqt")
+
+# Features spanning orders of magnitude, compared in log10 space when log_scale=True
+LOG_FEATURES = ("pl_rade", "pl_masse", "pl_orbper")
+
+
+# --------------------------------------------------------------
+# 💫 1. Nearest-neighbor index
+# --------------------------------------------------------------
+class SimilarityIndex:
+    """
+    k-nearest-neighbor search over normalized planet properties.
+
+    The archive lists several parameter sets per planet, so each planet is
+    reduced to the median of its reported values first. Features are
+    optionally log-scaled and then standardized (zero mean, unit variance)
+    so no single property dominates the distance.
+
+    Missing values: a search compares planets only on the features the
+    query provides, using a KD-tree over the planets that have all of
+    them. A tree for every non-empty feature subset is built up front, so
+    no query pays a build cost and the index is read-only once built
+    (safe to share across sessions).
+    """
+
+    def __init__(self, df, features=SIMILARITY_FEATURES, log_scale=True):
+        """
+        Build the index from the full dataset.
+
+        Args:
+            df (DataFrame): full dataset
+            features (tuple): numeric columns to compare on
+            log_scale (bool): compare LOG_FEATURES in log10 space
+        """
+        self.features = tuple(features)
+        self.log_scale = log_scale
+
+        planets = planet_medians(df, self.features, first=["hostname"])
+        planets = planets[planets[list(self.features)].notna().any(axis=1)]
+
+        self.planets = planets.reset_index()
+        self.planets["pl_name"] = self.planets["pl_name"].astype(object)
+        self.planets["hostname"] = self.planets["hostname"].astype(object)
+        self._positions = pd.Series(np.arange(len(self.planets)), index=self.planets["pl_name"])
+
+        scaled = self._transform(self.planets[list(self.features)].to_numpy(dtype=float))
+        self._mean = np.nanmean(scaled, axis=0)
+        self._std = np.nanstd(scaled, axis=0)
+        self._std[~(self._std > 0)] = 1.0
+        self._points = (scaled - self._mean) / self._std
+
+        self._trees = {
+            subset: self._build_tree(subset)
+            for size in range(1, len(self.features) + 1)
+            for subset in combinations(self.features, size)
+        }
+
+    @property
+    def names(self):
+        """Planet names available for searching, sorted."""
+        return self.planets["pl_name"]
+
+    def _transform(self, values):
+        """Apply log scaling to LOG_FEATURES; non-positive values become missing."""
+        values = np.array(values, dtype=float)
+        if self.log_scale:
+            for i, feature in enumerate(self.features):
+                if feature in LOG_FEATURES:
+                    col = values[..., i]
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        values[..., i] = np.where(col > 0, np.log10(col), np.nan)
+        return values
+
+    def _build_tree(self, subset):
+        """Return (tree, row positions) for planets with every feature in `subset`."""
+        cols = [self.features.index(f) for f in subset]
+        points = self._points[:, cols]
+        rows = np.flatnonzero(~np.isnan(points).any(axis=1))
+        return cKDTree(points[rows]), rows
+
+    # ----------------------------------------------------------
+    # 💫 2. Queries
+    # ----------------------------------------------------------
+    def query(self, pl_name=None, values=None, k=10, features=None):
+        """
+        Find the planets most similar to a known planet or to given values.
+
+        Args:
+            pl_name (str or None): name of a planet in the index
+            values (dict or None): raw feature values, e.g. {"pl_rade": 1.0}
+            k (int): number of neighbors to return
+            features (iterable or None): restrict the comparison to these
+                                         features (default: all available)
+
+        Returns:
+            DataFrame: neighbors ordered by distance, with a "distance"
+                       column in standardized units
+        """
+        if (pl_name is None) == (values is None):
+            raise ValueError("Pass exactly one of pl_name or values")
+
+        if pl_name is not None:
+            if pl_name not in self._positions.index:
+                raise KeyError(f"Unknown planet (or no comparable properties): {pl_name}")
+            point = self._points[self._positions[pl_name]]
+        else:
+            unknown = set(values) - set(self.features)
+            if unknown:
+                raise ValueError(f"Unsupported similarity features: {sorted(unknown)}")
+            raw = [values.get(f, np.nan) for f in self.features]
+            raw = [np.nan if v is None else v for v in raw]
+            point = (self._transform(raw) - self._mean) / self._std
+
+        wanted = self.features if features is None else tuple(f for f in self.features if f in features)
+        subset = tuple(f for f, v in zip(self.features, point) if f in wanted and not np.isnan(v))
+        if not subset:
+            raise ValueError("The query has none of the similarity features")
+
+        tree, rows = self._trees[subset]
+        cols = [self.features.index(f) for f in subset]
+
+        # Ask for one extra so the query planet itself can be dropped
+        n = min(k + (pl_name is not None), len(rows))
+        if n == 0:
+            return self.planets.iloc[:0].assign(distance=np.array([], dtype=float))
+        dist, idx = tree.query(point[cols], k=n)
+        dist, idx = np.atleast_1d(dist), np.atleast_1d(idx)
+
+        result = self.planets.iloc[rows[idx]].assign(distance=dist)
+        if pl_name is not None:
+            result = result[result["pl_name"] != pl_name]
+        return result.head(k).reset_index(drop=True)
+
+
+def build_similarity_index(df, log_scale=True):
+    """Build a SimilarityIndex over SIMILARITY_FEATURES (once per dataset load)."""
+    return SimilarityIndex(df, log_scale=log_scale)
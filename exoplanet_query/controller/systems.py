@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+# Columns summarized per planetary system
+SUMMARY_COLUMNS = ["pl_name", "pl_rade", "pl_masse", "st_rad"]
+
+
+# --------------------------------------------------------------
+# 💫 1. Host-grouped (CSR-style) layout
+# --------------------------------------------------------------
+def _group_by_host(df):
+    """
+    Return (hosts, rows, offsets) for the dataset.
+
+    hosts are the sorted distinct host names, rows the dataset row
+    positions ordered by host, and offsets[i]:offsets[i + 1] the slice
+    of rows belonging to hosts[i]. Rows without a host are left out.
+    """
+    codes, hosts = pd.factorize(df["hostname"], sort=True)
+    rows = np.argsort(codes, kind="stable")
+    rows = rows[codes[rows] >= 0]
+    counts = np.bincount(codes[codes >= 0], minlength=len(hosts))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return np.asarray(hosts, dtype=object), rows, offsets
+
+
+def _host_signatures(df, rows, offsets):
+    """
+    Hash each system's summarized columns into one value so changed
+    systems can be detected after a refresh. Row order inside a system
+    does not matter.
+    """
+    if not len(rows):
+        return np.zeros(len(offsets) - 1, dtype=np.uint64)
+    row_hashes = pd.util.hash_pandas_object(df[SUMMARY_COLUMNS], index=False).to_numpy()[rows]
+    return np.add.reduceat(row_hashes, offsets[:-1]) if len(offsets) > 1 else row_hashes[:0]
+
+
+def _summarize(df, hosts, rows, offsets):
+    """Compute per-system aggregates for the given hosts."""
+    counts = np.diff(offsets)
+    host_of_row = np.repeat(np.arange(len(hosts)), counts)
+    grouped = (
+        df[SUMMARY_COLUMNS]
+        .iloc[rows]
+        .assign(pl_name=lambda d: d["pl_name"].astype(object))
+        .groupby(host_of_row)
+    )
+
+    summary = pd.DataFrame({
+        "planet_count": grouped["pl_name"].nunique(),
+        "rows": counts,
+        "pl_rade_min": grouped["pl_rade"].min(),
+        "pl_rade_max": grouped["pl_rade"].max(),
+        "pl_masse_min": grouped["pl_masse"].min(),
+        "pl_masse_max": grouped["pl_masse"].max(),
+        "st_rad": grouped["st_rad"].median(),
+    })
+    summary.index = pd.Index(hosts, name="hostname")
+    return summary
+
+
+class SystemLayout:
+    """
+    Dataset rows grouped by host star for whole-system lookups.
+
+    Rows are kept as a host-sorted permutation of the dataset with an
+    offsets array (CSR-style), so all planets of a system are found with
+    one dictionary lookup and one slice instead of scanning the table.
+    Per-system aggregates are precomputed in `summary`.
+    """
+
+    def __init__(self, df, hosts, rows, offsets, summary, signatures, changed_hosts=()):
+        self.df = df
+        self.hosts = hosts
+        self.rows = rows
+        self.offsets = offsets
+        self.summary = summary
+        self._signatures = signatures
+        self.changed_hosts = list(changed_hosts)
+        self._lookup = {host: i for i, host in enumerate(hosts)}
+
+    def __contains__(self, host):
+        return host in self._lookup
+
+    def __len__(self):
+        return len(self.hosts)
+
+    def planets(self, host):
+        """
+        Return every dataset row for the given host star.
+
+        Raises:
+            KeyError: if the host is not in the dataset
+        """
+        i = self._lookup[host]
+        return self.df.iloc[self.rows[self.offsets[i]:self.offsets[i + 1]]]
+
+    def system_summary(self, host):
+        """Return the precomputed aggregates (a Series) for one system."""
+        return self.summary.iloc[self._lookup[host]]
+
+    # ----------------------------------------------------------
+    # 💫 2. Incremental refresh
+    # ----------------------------------------------------------
+    def refresh(self, df):
+        """
+        Build the layout for a refreshed dataset, reusing the aggregates
+        of every system whose rows did not change.
+
+        Returns:
+            SystemLayout: layout for `df`; its `changed_hosts` lists the
+                          systems that were added or re-aggregated
+        """
+        hosts, rows, offsets = _group_by_host(df)
+        signatures = _host_signatures(df, rows, offsets)
+
+        previous = pd.Index(self.hosts).get_indexer(hosts)
+        unchanged = previous >= 0
+        unchanged[unchanged] = self._signatures[previous[unchanged]] == signatures[unchanged]
+        changed = np.flatnonzero(~unchanged)
+
+        summary = self.summary.loc[hosts[unchanged]]
+        if len(changed):
+            sub_rows = np.concatenate([rows[offsets[i]:offsets[i + 1]] for i in changed])
+            sub_offsets = np.concatenate([[0], np.cumsum(np.diff(offsets)[changed])])
+            fresh = _summarize(df, hosts[changed], sub_rows, sub_offsets)
+            summary = pd.concat([summary, fresh]).reindex(hosts)
+
+        return SystemLayout(df, hosts, rows, offsets, summary, signatures, hosts[changed])
+
+
+def build_system_layout(df):
+    """Build the host-grouped layout and per-system aggregates for a dataset."""
+    hosts, rows, offsets = _group_by_host(df)
+    summary = _summarize(df, hosts, rows, offsets)
+    signatures = _host_signatures(df, rows, offsets)
+    return SystemLayout(df, hosts, rows, offsets, summary, signatures, hosts)
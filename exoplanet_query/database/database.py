@@ -1,5 +1,6 @@
 import sqlite3
 import pandas as pd
+from controller.expressions import from_filters, to_sql
 
 class Database:
     """
@@ -94,23 +95,19 @@ class Database:
         Streamlit will typically use DataFrame filtering instead,
         but this remains available for compatibility.
         """
-        base = "SELECT * FROM exoplanets WHERE 1=1"
-        params = []
+        expr = from_filters(name=name, year=year, method=method, host=host, facility=facility)
+        return self.query_expression(expr)
 
-        if name:
-            base += " AND pl_name LIKE ?"
-            params.append(f"%{name}%")
-        if year:
-            base += " AND disc_year = ?"
-            params.append(year)
-        if method:
-            base += " AND discoverymethod = ?"
-            params.append(method)
-        if host:
-            base += " AND hostname LIKE ?"
-            params.append(f"%{host}%")
-        if facility:
-            base += " AND disc_facility = ?"
-            params.append(facility)
+    # ------------------------------------------------------------------
+    # 💫 6. Query by filter expression
+    # ------------------------------------------------------------------
+    def query_expression(self, expr):
+        """
+        Run a filter expression (see controller.expressions) against SQLite.
 
-        return self.execute_query(base, params=params, return_df=True)
\ No newline at end of file
+        The expression is translated to a parameterized WHERE clause with
+        the same semantics as the DataFrame evaluator.
+        """
+        clause, params = to_sql(expr)
+        query = f"SELECT * FROM exoplanets WHERE {clause}"
+        return self.execute_query(query, params=params, return_df=True)
\ No newline at end of file
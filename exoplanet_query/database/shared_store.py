@@ -0,0 +1,319 @@
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Environment variable pointing every Streamlit worker on a host at the
+# same published dataset directory.
+SHARED_DIR_ENV = "EXOPLANET_SHARED_DIR"
+
+MANIFEST_NAME = "manifest.json"
+
+
+# -------------------------------------------------------------------
+# 🌟 1. Publish a DataFrame as memory-mappable column files
+# -------------------------------------------------------------------
+def _codes_dtype(n_categories):
+    """
+    Return the integer dtype pandas uses for Categorical codes, so the
+    memory-mapped codes can be wrapped without an astype copy.
+    """
+    if n_categories < np.iinfo(np.int8).max:
+        return np.int8
+    if n_categories < np.iinfo(np.int16).max:
+        return np.int16
+    if n_categories < np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+
+def _version_number(name):
+    """Return the version number in a version directory name, or None."""
+    number = name.rpartition("-v")[2]
+    return int(number) if number.isdigit() else None
+
+
+def _remove_versions_before(parent, base, keep):
+    """
+    Delete published versions of `base` older than the one named `keep`.
+
+    `keep` itself stays on disk until the next publish, so a worker that
+    resolved the link just before a swap can still open it.
+    """
+    oldest = _version_number(keep)
+    if oldest is None:
+        return
+    prefix = f".{base}-v"
+    for entry in os.listdir(parent):
+        number = _version_number(entry) if entry.startswith(prefix) else None
+        if number is not None and number < oldest:
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+
+def publish_shared_dataset(df, directory, overwrite=False):
+    """
+    Write the DataFrame to `directory` as one .npy file per column.
+
+    Numeric columns are stored as-is; text columns are stored as
+    categorical codes plus a JSON list of categories. Each publish writes
+    a new versioned sibling directory, and `directory` is a symlink to
+    the current version. The link is created (or swapped with
+    os.replace) atomically, so workers always see one complete dataset,
+    never a half-written or missing one, and without `overwrite` only the
+    first publisher wins.
+
+    Args:
+        df (DataFrame): dataset to publish
+        directory (str): target path (a symlink to the current version)
+        overwrite (bool): replace an existing published dataset
+
+    Returns:
+        str: the published directory
+    """
+    directory = os.path.abspath(directory)
+    parent, base = os.path.split(directory)
+    os.makedirs(parent, exist_ok=True)
+
+    if shared_dataset_exists(directory) and not overwrite:
+        return directory
+
+    if os.path.lexists(directory) and not os.path.islink(directory):
+        raise FileExistsError(
+            f"Cannot publish the dataset to {directory}: the path exists and is "
+            f"not a dataset link written by this module. Remove it or choose another path."
+        )
+
+    staging = tempfile.mkdtemp(prefix=f".{base}-staging-", dir=parent)
+    manifest = {"n_rows": len(df), "columns": []}
+
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        filename = f"col_{i}.npy"
+
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            np.save(os.path.join(staging, filename), values.to_numpy())
+            manifest["columns"].append(
+                {"name": column, "kind": "numeric", "file": filename}
+            )
+        else:
+            codes, categories = pd.factorize(values, sort=True)
+            codes = codes.astype(_codes_dtype(len(categories)))
+            np.save(os.path.join(staging, filename), codes)
+            manifest["columns"].append({
+                "name": column,
+                "kind": "categorical",
+                "file": filename,
+                "categories": [str(c) for c in categories],
+            })
+
+    with open(os.path.join(staging, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f)
+
+    version = f".{base}-v{time.time_ns()}"
+    os.rename(staging, os.path.join(parent, version))
+
+    if os.path.islink(directory):
+        # Swap the link in one step; workers that already mapped the old
+        # files keep valid mappings.
+        previous = os.readlink(directory)
+        link = os.path.join(parent, f".{base}-link-{os.getpid()}-{time.time_ns()}")
+        os.symlink(version, link)
+        os.replace(link, directory)
+        _remove_versions_before(parent, base, os.path.basename(previous))
+        return directory
+
+    try:
+        os.symlink(version, directory)
+    except FileExistsError as exc:
+        shutil.rmtree(os.path.join(parent, version), ignore_errors=True)
+        if not shared_dataset_exists(directory):
+            raise FileExistsError(
+                f"Cannot publish the dataset to {directory}: the path exists and is "
+                f"not a dataset link written by this module. Remove it or choose another path."
+            ) from exc
+        # Another worker published first; use theirs.
+
+    return directory
+
+
+def refresh_shared_dataset(directory):
+    """
+    Fetch a fresh copy of the dataset and republish it over `directory`.
+
+    Workers notice the new version through dataset_version() and reopen it.
+    """
+    from database.data_loader import get_exoplanet_data
+    return publish_shared_dataset(get_exoplanet_data(), directory, overwrite=True)
+
+
+def shared_dataset_exists(directory):
+    """Return True if a complete dataset has been published to `directory`."""
+    return os.path.isfile(os.path.join(directory, MANIFEST_NAME))
+
+
+def dataset_version(directory):
+    """
+    Return a token that changes whenever the dataset is republished
+    (the manifest's modification time), or None if nothing is published.
+    """
+    try:
+        return os.stat(os.path.join(directory, MANIFEST_NAME)).st_mtime_ns
+    except OSError:
+        return None
+
+
+# -------------------------------------------------------------------
+# 🌟 2. Open a published dataset zero-copy
+# -------------------------------------------------------------------
+def open_shared_dataset(directory, mmap=True):
+    """
+    Open a published dataset as a DataFrame backed by read-only memory maps.
+
+    Every worker that opens the same directory shares the underlying
+    pages through the OS page cache instead of holding a private copy.
+    Text columns come back as pandas Categoricals over the shared codes.
+
+    Args:
+        directory (str): directory written by publish_shared_dataset
+        mmap (bool): set False to load private in-memory copies instead
+                     (useful for memory comparisons)
+
+    Returns:
+        DataFrame: the dataset
+    """
+    # Resolve the link once so a concurrent republish cannot mix the
+    # manifest of one version with the column files of another.
+    directory = os.path.realpath(directory)
+
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+
+    mmap_mode = "r" if mmap else None
+    columns = {}
+
+    for entry in manifest["columns"]:
+        values = np.load(os.path.join(directory, entry["file"]), mmap_mode=mmap_mode)
+
+        if entry["kind"] == "categorical":
+            values = pd.Categorical.from_codes(
+                values,
+                categories=pd.Index(entry["categories"], dtype=object),
+                validate=False,
+            )
+
+        columns[entry["name"]] = values
+
+    # copy=False keeps one block per column so nothing gets consolidated
+    # (and therefore copied) into private memory.
+    return pd.DataFrame(columns, copy=False)
+
+
+# -------------------------------------------------------------------
+# 🌟 3. Resident memory reporting
+# -------------------------------------------------------------------
+def memory_usage_mb():
+    """
+    Return the current process's resident (Rss) and proportional (Pss)
+    memory in MB.
+
+    Rss counts shared pages in full for every process that maps them; Pss
+    divides shared pages between those processes, so it is the better
+    per-worker figure when the dataset is shared. Pss is None where
+    /proc/self/smaps_rollup is unavailable.
+    """
+    usage = {"rss": None, "pss": None}
+
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    usage[key.lower()] = int(rest.split()[0]) / 1024
+        return usage
+    except OSError:
+        pass
+
+    import resource
+    usage["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return usage
+
+
+def _worker(directory, mmap, barrier, results):
+    """Open the dataset, touch every column like a query would, report memory."""
+    df = open_shared_dataset(directory, mmap=mmap)
+
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values.cat.codes.sum()
+        else:
+            values.sum()
+
+    # Measure only once every worker holds its copy / mapping.
+    barrier.wait()
+    results.put(memory_usage_mb())
+    barrier.wait()
+
+
+def compare_worker_memory(directory, workers=4):
+    """
+    Start `workers` processes with private copies and again with the
+    shared mapping, and return the per-worker memory for each mode.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    report = {}
+
+    for label, mmap in (("private", False), ("shared", True)):
+        barrier = ctx.Barrier(workers)
+        results = ctx.Queue()
+        procs = [
+            ctx.Process(target=_worker, args=(directory, mmap, barrier, results))
+            for _ in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        report[label] = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Publish the exoplanet dataset for shared use and "
+                    "report per-worker memory with and without sharing."
+    )
+    parser.add_argument("directory", help="shared dataset directory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help="fetch fresh data, republish it over the directory and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.refresh:
+        refresh_shared_dataset(args.directory)
+        return
+
+    if not shared_dataset_exists(args.directory):
+        from database.data_loader import get_exoplanet_data
+        publish_shared_dataset(get_exoplanet_data(), args.directory)
+
+    report = compare_worker_memory(args.directory, workers=args.workers)
+
+    for label, rows in report.items():
+        rss = np.mean([r["rss"] for r in rows])
+        pss = [r["pss"] for r in rows if r["pss"] is not None]
+        pss_text = f"{np.mean(pss):8.1f} MB" if pss else "     n/a"
+        print(f"{label:>8}: Rss {rss:8.1f} MB   Pss {pss_text}   ({len(rows)} workers)")
+
+
+if __name__ == "__main__":
+    main()
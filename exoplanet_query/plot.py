@@ -1,4 +1,5 @@
 import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
@@ -7,6 +8,8 @@ import statsmodels.api as sm
 AXIS_LABELS = {
     "pl_rade": "Planet Radius (R⊕)",
     "pl_masse": "Planet Mass (M⊕)",
+    "pl_orbper": "Orbital Period (days)",
+    "pl_eqt": "Equilibrium Temperature (K)",
 }
 
 def get_trendline_stats(df, xcol, ycol):
@@ -305,7 +308,8 @@ def method_radius_boxplots(df, threshold=30):
     # Group rare methods into "Other"
     method_counts = clean["discoverymethod"].value_counts()
     keep = method_counts[method_counts > threshold].index
-    clean["method_group"] = clean["discoverymethod"].where(clean["discoverymethod"].isin(keep), "Other")
+    methods = clean["discoverymethod"].astype(object)  # shared datasets use Categoricals
+    clean["method_group"] = methods.where(methods.isin(keep), "Other")
 
     figs = {}
 
@@ -340,4 +344,45 @@ def method_radius_boxplots(df, threshold=30):
     fig_full.update_layout(dragmode=False)
     figs["full"] = fig_full
 
-    return figs
\ No newline at end of file
+    return figs
+
+
+def density_map_plot(tile):
+    """
+    Create a log-binned density map from a pre-aggregated tile.
+
+    The tile comes from DensityPyramid.tile(), so the figure size depends
+    only on the requested bin cap, not on catalog size. Unlike the
+    scatter plots, zoom and pan stay enabled.
+    """
+    x_edges, y_edges, counts = tile["x_edges"], tile["y_edges"], tile["counts"]
+
+    # Color by log count; empty bins are left transparent
+    with np.errstate(divide="ignore"):
+        z = np.where(counts > 0, np.log10(counts), np.nan)
+
+    fig = go.Figure(
+        go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=z,
+            customdata=counts,
+            colorscale="Viridis",
+            colorbar=dict(title="log₁₀(Planets)"),
+            hovertemplate=(
+                f"log₁₀({pretty(tile['x'])})=%{{x:.2f}}<br>"
+                f"log₁₀({pretty(tile['y'])})=%{{y:.2f}}<br>"
+                "Planets=%{customdata}<extra></extra>"
+            ),
+        )
+    )
+
+    fig.update_layout(
+        title=f"{pretty(tile['x'])} vs {pretty(tile['y'])} (density)",
+        xaxis_title=f"log₁₀({pretty(tile['x'])})",
+        yaxis_title=f"log₁₀({pretty(tile['y'])})",
+        template="plotly_dark",
+        dragmode="zoom",
+    )
+
+    return fig
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The app imports its modules relative to exoplanet_query/ (that is how
+# `streamlit run exoplanet_query/app.py` resolves them), so mirror that here.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "exoplanet_query"))
@@ -0,0 +1,120 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from controller.expressions import And, Contains, Eq, In, Not, Or, Range, evaluate, collect_column_stats
+from database.database import Database
+from database.shared_store import open_shared_dataset, publish_shared_dataset
+
+METHODS = ["Transit", "Radial Velocity", "Imaging", "Microlensing"]
+
+
+def make_catalog(n=2000, seed=0):
+    """Small synthetic catalog with the archive's columns and some gaps."""
+    rng = np.random.default_rng(seed)
+    hosts = np.array([f"HD {i}" for i in range(n // 5)], dtype=object)
+    host = rng.choice(hosts, n)
+    df = pd.DataFrame({
+        "pl_name": [f"{h} {c}" for h, c in zip(host, rng.choice(list("bcde"), n))],
+        "disc_year": rng.integers(1995, 2025, n),
+        "discoverymethod": rng.choice(METHODS, n).astype(object),
+        "hostname": host,
+        "disc_facility": rng.choice([f"Facility {i}" for i in range(12)], n).astype(object),
+        "pl_rade": np.where(rng.random(n) < 0.2, np.nan, 10 ** rng.uniform(-0.5, 1.4, n)),
+        "pl_masse": np.where(rng.random(n) < 0.5, np.nan, 10 ** rng.uniform(-0.5, 3.5, n)),
+    })
+    df.loc[::37, "discoverymethod"] = None
+    df.loc[::53, "hostname"] = None
+    return df
+
+
+def random_expr(rng, depth=0):
+    kind = rng.integers(0, 8 if depth < 3 else 5)
+    if kind == 0:
+        return Eq("discoverymethod", rng.choice(METHODS + ["Nope"]))
+    if kind == 1:
+        return In("disc_year", [int(y) for y in rng.integers(1995, 2025, 3)])
+    if kind == 2:
+        high = None if rng.random() < 0.5 else float(rng.uniform(5, 30))
+        return Range("pl_rade", low=float(rng.uniform(0, 5)), high=high)
+    if kind == 3:
+        return Contains("hostname", str(rng.integers(1, 99)))
+    if kind == 4:
+        low, high = sorted(f"HD {v}" for v in rng.integers(0, 400, 2))
+        return Range("pl_name", low=low, high=high)
+    if kind == 5:
+        return And(*[random_expr(rng, depth + 1) for _ in range(rng.integers(0, 4))])
+    if kind == 6:
+        return Or(*[random_expr(rng, depth + 1) for _ in range(rng.integers(0, 4))])
+    return Not(random_expr(rng, depth + 1))
+
+
+def brute_force(expr, df):
+    """Row-by-row reference: missing values never satisfy a predicate."""
+    if isinstance(expr, And):
+        mask = np.ones(len(df), dtype=bool)
+        for child in expr.children:
+            mask &= brute_force(child, df)
+        return mask
+    if isinstance(expr, Or):
+        mask = np.zeros(len(df), dtype=bool)
+        for child in expr.children:
+            mask |= brute_force(child, df)
+        return mask
+    if isinstance(expr, Not):
+        return ~brute_force(expr.child, df)
+
+    def test(v):
+        if v is None or (isinstance(v, float) and np.isnan(v)):
+            return False
+        if isinstance(expr, Eq):
+            return v == expr.value
+        if isinstance(expr, In):
+            return v in expr.values
+        if isinstance(expr, Range):
+            return (expr.low is None or v >= expr.low) and (expr.high is None or v <= expr.high)
+        return expr.text.lower() in v.lower()
+
+    return np.array([test(v) for v in df[expr.column].astype(object)], dtype=bool)
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return make_catalog()
+
+
+@pytest.fixture(scope="module")
+def shared_catalog(catalog, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("shared") / "data"
+    return open_shared_dataset(publish_shared_dataset(catalog, str(directory)))
+
+
+@pytest.fixture(scope="module")
+def database(catalog, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("db") / "exoplanets.db")
+    with sqlite3.connect(path) as conn:
+        catalog.to_sql("exoplanets", conn, index=False)
+    return Database(path)
+
+
+def test_dataframe_shared_and_sql_paths_agree(catalog, shared_catalog, database):
+    rng = np.random.default_rng(1)
+    stats = collect_column_stats(catalog)
+
+    for _ in range(300):
+        expr = random_expr(rng)
+        expected = catalog.index[brute_force(expr, catalog)]
+
+        assert evaluate(expr, catalog, stats).index.equals(expected), expr
+        assert evaluate(expr, shared_catalog, stats).index.equals(expected), expr
+        assert len(database.query_expression(expr)) == len(expected), expr
+
+
+def test_range_on_shared_text_column(catalog, shared_catalog):
+    expr = Range("pl_name", "HD 1", "HD 2")
+    plain = evaluate(expr, catalog)
+
+    assert len(plain) > 0
+    assert evaluate(expr, shared_catalog).index.equals(plain.index)
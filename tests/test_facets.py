@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from controller import facets as facets_module
+from controller.facets import FacetIndex
+
+METHODS = ["Transit", "Radial Velocity", "Imaging", "Microlensing"]
+
+SELECTIONS = [
+    {},
+    {"discoverymethod": "Transit"},
+    {"discoverymethod": "Transit", "disc_year": 2016},
+    {"discoverymethod": "Imaging", "disc_facility": "Facility 3", "disc_year": 2010},
+    {"discoverymethod": "Nope"},
+]
+
+
+def make_catalog(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "discoverymethod": rng.choice(METHODS, n).astype(object),
+        "disc_facility": rng.choice([f"Facility {i}" for i in range(12)], n).astype(object),
+        "disc_year": rng.integers(1995, 2025, n),
+    })
+    df.loc[::37, "discoverymethod"] = None
+    return df
+
+
+def brute_force_counts(df, column, selections, base_rows):
+    """Count `column` values over rows matching every selection but its own."""
+    mask = np.zeros(len(df), dtype=bool) if base_rows is not None else np.ones(len(df), dtype=bool)
+    if base_rows is not None:
+        mask[base_rows] = True
+    for other, value in selections.items():
+        if other != column:
+            mask &= (df[other] == value).to_numpy()
+    return df.loc[mask, column].value_counts()
+
+
+@pytest.mark.parametrize("use_cube", [True, False])
+def test_counts_match_brute_force(monkeypatch, use_cube):
+    if not use_cube:
+        monkeypatch.setattr(facets_module, "MAX_CUBE_CELLS", 0)
+
+    df = make_catalog()
+    index = FacetIndex(df)
+    assert (index._cube is not None) == use_cube
+
+    base_rows = np.flatnonzero(np.random.default_rng(1).random(len(df)) < 0.3)
+
+    for selections in SELECTIONS:
+        for rows in (None, base_rows):
+            counts = index.counts(selections, rows)
+            for column in index.columns:
+                expected = brute_force_counts(df, column, selections, rows)
+                got = counts[column]
+                assert got[got > 0].sort_index().to_dict() == expected.sort_index().to_dict(), (selections, column)
+
+
+def test_matching_rows_intersects_postings():
+    df = make_catalog()
+    index = FacetIndex(df)
+    selections = {"discoverymethod": "Transit", "disc_year": 2016}
+
+    expected = np.flatnonzero(((df["discoverymethod"] == "Transit") & (df["disc_year"] == 2016)).to_numpy())
+    np.testing.assert_array_equal(index.matching_rows(selections), expected)
+    assert index.matching_rows({}) is None
+    assert len(index.matching_rows({"disc_facility": "Nope"})) == 0
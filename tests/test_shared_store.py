@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+import pytest
+
+from database.shared_store import dataset_version, open_shared_dataset, publish_shared_dataset
+
+
+def frame(n):
+    return pd.DataFrame({"pl_name": [f"P {i}" for i in range(n)], "pl_rade": range(n)})
+
+
+def test_republish_swaps_versions_without_a_gap(tmp_path):
+    directory = str(tmp_path / "data")
+
+    publish_shared_dataset(frame(3), directory)
+    first = open_shared_dataset(directory)
+    first_version = dataset_version(directory)
+
+    # Without overwrite the existing dataset wins
+    publish_shared_dataset(frame(5), directory)
+    assert len(open_shared_dataset(directory)) == 3
+
+    publish_shared_dataset(frame(5), directory, overwrite=True)
+    assert len(open_shared_dataset(directory)) == 5
+    assert dataset_version(directory) != first_version
+    assert first["pl_name"].tolist() == ["P 0", "P 1", "P 2"]
+
+    publish_shared_dataset(frame(7), directory, overwrite=True)
+    assert len(open_shared_dataset(directory)) == 7
+
+    # The current and the previous version stay on disk, older ones go
+    versions = [e for e in os.listdir(tmp_path) if e.startswith(".data-v")]
+    assert len(versions) == 2
+
+
+def test_foreign_directory_is_rejected(tmp_path):
+    directory = tmp_path / "data"
+    directory.mkdir()
+    (directory / "notes.txt").write_text("not a dataset")
+
+    with pytest.raises(FileExistsError):
+        publish_shared_dataset(frame(3), str(directory))
+    assert not [e for e in os.listdir(tmp_path) if e.startswith(".data-")]
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from controller.systems import build_system_layout
+
+
+def make_systems(n_hosts=300, seed=0):
+    """Synthetic catalog with several rows (parameter sets) per planet."""
+    rng = np.random.default_rng(seed)
+    n = n_hosts * 6
+    host = rng.choice([f"HD {i}" for i in range(n_hosts)], n).astype(object)
+    df = pd.DataFrame({
+        "pl_name": [f"{h} {c}" for h, c in zip(host, rng.choice(list("bcd"), n))],
+        "hostname": host,
+        "pl_rade": np.where(rng.random(n) < 0.2, np.nan, rng.uniform(0.5, 20, n)),
+        "pl_masse": np.where(rng.random(n) < 0.5, np.nan, rng.uniform(0.5, 3000, n)),
+        "st_rad": rng.uniform(0.1, 3, n),
+    })
+    df.loc[::41, "hostname"] = None
+    return df
+
+
+def test_refresh_matches_a_full_rebuild():
+    df = make_systems()
+    layout = build_system_layout(df)
+    assert "HD 7" in layout and "HD 12" in layout
+
+    df2 = df.copy()
+    df2.loc[df2["hostname"] == "HD 7", "pl_rade"] = 99.0                     # edited
+    df2 = df2[df2["hostname"] != "HD 12"]                                     # removed
+    added = pd.DataFrame({"pl_name": ["New 1 b", "New 1 c"], "hostname": ["New 1", "New 1"],
+                          "pl_rade": [1.0, 2.0], "pl_masse": [np.nan, 5.0], "st_rad": [1.1, 1.1]})
+    df2 = pd.concat([df2, added], ignore_index=True)                          # added
+
+    refreshed = layout.refresh(df2)
+    expected = build_system_layout(df2)
+
+    assert sorted(refreshed.changed_hosts) == ["HD 7", "New 1"]
+    assert "HD 12" not in refreshed
+    assert list(refreshed.hosts) == list(expected.hosts)
+    tm.assert_frame_equal(refreshed.summary, expected.summary)
+    for host in ("HD 7", "HD 3", "New 1"):
+        tm.assert_frame_equal(refreshed.planets(host), expected.planets(host))
+        tm.assert_series_equal(refreshed.system_summary(host), expected.system_summary(host))
+
+
+def test_refresh_without_changes_reuses_every_system():
+    df = make_systems(seed=1)
+    refreshed = build_system_layout(df).refresh(df.copy())
+
+    assert refreshed.changed_hosts == []
+    tm.assert_frame_equal(refreshed.summary, build_system_layout(df).summary)